@@ -8,6 +8,14 @@
 # REQUIREMENTS:
 #     - Python 3.6 or higher
 #     - PyYAML library (install with: pip install pyyaml)
+#     - libyaml (recommended) - PyYAML uses its C loader automatically when it
+#       was built against libyaml, which parses large configs much faster.
+#       Linux: install libyaml-dev (Debian/Ubuntu) or libyaml-devel (RHEL)
+#       before installing PyYAML. Check with:
+#         python -c "import yaml; print(yaml.__with_libyaml__)"
+#     - orjson (optional) - faster JSON output (install with: pip install orjson)
+#     - ruamel.yaml (optional) - alternative C-backed loader, used with
+#       --loader ruamel (install with: pip install ruamel.yaml)
 
 # HOW TO RUN THIS SCRIPT:
 #     1. Save this script as 'fortigate_converter.py'
@@ -31,6 +39,12 @@
     
 #     - To make output more readable (pretty print):
 #       python fortigate_converter.py fortigate.yaml --pretty
+    
+#     - To list every converted object as it is processed:
+#       python fortigate_converter.py fortigate.yaml --verbose
+    
+#     - To parse with ruamel.yaml instead of PyYAML:
+#       python fortigate_converter.py fortigate.yaml --loader ruamel
 
 # EXPECTED YAML FORMAT:
 #     The script expects FortiGate configuration in YAML format like:
@@ -52,15 +66,344 @@
 #             uuid: 9a1f0206-c025-51e8-4276-05657d04ce42
 #             comment: "FUN"
 #             subnet: [10.0.22.0, 255.255.255.0]
+#         - VENDOR_PORTAL:
+#             type: fqdn
+#             fqdn: portal.example.com
+    
+#     The nested layout with 'name' keys is also accepted:
+    
+#     firewall:
+#         address:
+#             - name: L_BLOCK_EAST_SVRS
+#               comment: "FUN"
+#               subnet: 10.0.22.0 255.255.255.0
+#             - name: VPN_POOL
+#               start-ip: 10.212.134.200
+#               end-ip: 10.212.134.210
+#             - name: MGMT_HOST
+#               ip: 10.0.0.10
+    
+#     Entries without a 'type' are classified by their fields: subnet,
+#     start-ip/end-ip (RANGE), fqdn (FQDN) or ip (HOST).
 ""
 
 import yaml
 import json
-import argparse
+import itertools
+import re
+import socket
 import sys
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 
+# Use the libyaml-backed C loader when PyYAML was built with it; fall back to
+# the pure-Python loader otherwise. Both produce identical results.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# orjson is optional - it writes JSON several times faster than the standard
+# library json module, which is used when orjson isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# NOTE: The conversion below is string and dict handling, which JIT compilers
+# such as Numba can't speed up (they fall back to object mode and run slower).
+# The only numeric step, netmask -> CIDR, is already a table lookup or two C
+# builtins (inet_aton + bit_count), so no compiled extension is needed either.
+
+# Population count (number of 1 bits) of an integer. int.bit_count() is a
+# single CPU instruction on Python 3.10+; older versions count the binary string.
+if sys.version_info >= (3, 10):
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+def _netmask_prefix_length(netmask: str) -> int:
+    """
+    Count the 1 bits in a non-standard dotted decimal netmask, i.e. one that
+    is not in _NETMASK_PREFIXES (e.g., non-contiguous "255.0.255.0" -> 16).
+    
+    socket.inet_aton() packs the mask into 4 bytes in C, so the whole
+    conversion is two builtin calls. Raises OSError for malformed masks.
+    """
+    return _popcount(int.from_bytes(socket.inet_aton(netmask), 'big'))
+
+
+# "IP NETMASK" subnet string with any amount of surrounding whitespace
+_SUBNET_RE = re.compile(r'\s*(\S+)\s+(\S+)')
+
+# CIDR prefix length of every standard (contiguous) netmask, /0 through /32,
+# worked out once at import: {'255.255.255.0': 24, '255.255.255.252': 30, ...}
+_NETMASK_PREFIXES = {
+    socket.inet_ntoa(((0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF).to_bytes(4, 'big')): prefix
+    for prefix in range(33)
+}
+
+
+def _netmask_to_cidr(netmask: str) -> int:
+    """
+    Convert subnet mask (e.g., 255.255.255.0) to CIDR notation (e.g., 24).
+    
+    This is necessary because FortiGate uses traditional netmask notation
+    while FTD API expects CIDR notation.
+    
+    Args:
+        netmask: Subnet mask in dotted decimal format (e.g., "255.255.255.0")
+        
+    Returns:
+        Integer representing CIDR prefix length (e.g., 24)
+    """
+    try:
+        # Standard netmasks are a single table lookup
+        prefix = _NETMASK_PREFIXES.get(netmask)
+        if prefix is not None:
+            return prefix
+        # Anything else: count the number of 1 bits in the netmask
+        # Example: 255.255.255.0 = 11111111.11111111.11111111.00000000 = 24 ones
+        return _netmask_prefix_length(netmask)
+    except (OSError, ValueError, TypeError):
+        # Malformed mask (OSError/ValueError) or not a string (TypeError)
+        # If conversion fails, default to /32 (single host)
+        print(f"Warning: Could not convert netmask '{netmask}', defaulting to /32",
+              file=sys.stderr)
+        return 32
+
+
+def _address_key(properties: Dict) -> Tuple:
+    """
+    Build the hashable cache key for _classify_address() from the
+    FortiGate address properties that decide its FTD subType and value.
+    
+    Args:
+        properties: Dictionary containing FortiGate address object properties
+        
+    Returns:
+        Tuple of (type, subnet, start-ip, end-ip, fqdn, ip), with None for
+        absent fields
+    """
+    subnet = properties.get('subnet')
+    if isinstance(subnet, str):
+        # Subnet is a string: "IP NETMASK"
+        # partition() splits on the single space without building a list
+        ip_addr, _, netmask = subnet.partition(' ')
+        if ip_addr and netmask and ' ' not in netmask:
+            subnet = (ip_addr, netmask)
+        else:
+            # Extra whitespace or a missing netmask - use the regex instead
+            match = _SUBNET_RE.match(subnet)
+            subnet = match.groups() if match else tuple(subnet.split())
+    elif subnet is not None:
+        # Subnet is a list: [IP, NETMASK] - lists can't be hashed, tuples can
+        subnet = tuple(subnet)
+    return (properties.get('type'), subnet,
+            properties.get('start-ip'), properties.get('end-ip'),
+            properties.get('fqdn'), properties.get('ip'))
+
+
+def _classify_subnet(address_key: Tuple) -> Tuple[str, Optional[str]]:
+    """Subnet address: convert [IP, NETMASK] to HOST/NETWORK "IP/CIDR"."""
+    subnet_list = address_key[1]
+    
+    # Check if subnet field exists
+    if subnet_list is not None:
+        # Example: [10.0.0.4, 255.255.255.252] or [10.0.2.0, 255.255.255.0]
+        if len(subnet_list) >= 2:
+            # YAML already gives dotted decimal values as strings, and the
+            # f-string below formats the IP either way
+            ip_addr, netmask = subnet_list[0], subnet_list[1]
+            if not isinstance(netmask, str):
+                netmask = str(netmask)
+            # Convert netmask to CIDR once and use it for both subType and value
+            cidr = _netmask_to_cidr(netmask)
+            # A /32 (netmask 255.255.255.255) is a single host
+            subtype = "HOST" if cidr == 32 else "NETWORK"
+            # FTD expects: "10.0.0.4/30" or "10.0.2.0/24"
+            return subtype, f"{ip_addr}/{cidr}"
+        else:
+            # If format is unexpected, return first element
+            return "NETWORK", str(subnet_list[0]) if subnet_list else ''
+    
+    # Default to HOST if we can't determine type
+    return "HOST", None
+
+
+def _classify_range(address_key: Tuple) -> Tuple[str, Optional[str]]:
+    """IP range address: format start-ip and end-ip as RANGE "IP1-IP2"."""
+    start_ip, end_ip = address_key[2] or '', address_key[3] or ''
+    # FTD expects: "192.168.1.10-192.168.1.20"
+    return "RANGE", f"{start_ip}-{end_ip}"
+
+
+def _classify_fqdn(address_key: Tuple) -> Tuple[str, Optional[str]]:
+    """FQDN address: pass the domain name through as FQDN."""
+    fqdn = address_key[4]
+    # FTD expects: "www.example.com"
+    return "FQDN", fqdn
+
+
+def _classify_host(address_key: Tuple) -> Tuple[str, Optional[str]]:
+    """Single IP address: pass the 'ip' field through as HOST."""
+    ip_addr = address_key[5]
+    # FTD expects: "192.168.1.10"
+    return "HOST", ip_addr
+
+
+# FortiGate address 'type' -> function that builds the FTD subType and value.
+# Any other type (including the default 'ipmask') is handled as a subnet.
+_ADDRESS_HANDLERS = {
+    'iprange': _classify_range,
+    'fqdn': _classify_fqdn,
+}
+
+
+def _untyped_address_handler(address_key: Tuple) -> Callable[[Tuple], Tuple[str, Optional[str]]]:
+    """
+    Pick the handler for an address without a 'type' field, as in the
+    'firewall.address' layout, from the fields it has. Checked in the same
+    order as main.py: subnet, start-ip/end-ip, fqdn, ip.
+    """
+    _, subnet, start_ip, end_ip, fqdn, ip_addr = address_key
+    if subnet is not None:
+        return _classify_subnet
+    if start_ip is not None and end_ip is not None:
+        return _classify_range
+    if fqdn is not None:
+        return _classify_fqdn
+    if ip_addr is not None:
+        return _classify_host
+    # Nothing recognizable - the subnet handler reports no value
+    return _classify_subnet
+
+
+@lru_cache(maxsize=4096)
+def _classify_address(address_key: Tuple) -> Tuple[str, Optional[str]]:
+    """
+    Determine the FTD address subType and value for a FortiGate address.
+    
+    - If 'type' field equals 'iprange' -> RANGE, "IP1-IP2"
+    - If 'type' field equals 'fqdn' -> FQDN, "www.example.com"
+    - If 'subnet' field exists, convert [IP, NETMASK] to "IP/CIDR":
+        - Check if CIDR is /32 (netmask 255.255.255.255) -> HOST
+        - Otherwise -> NETWORK
+    - Without a 'type' field, the fields present decide: start-ip/end-ip ->
+      RANGE, fqdn -> FQDN, ip -> HOST "IP"
+    
+    FTD supports different address subtypes:
+    - HOST: Single IP address (e.g., 192.168.1.10/32)
+    - NETWORK: Network with CIDR notation (e.g., 192.168.1.0/24)
+    - RANGE: IP address range (e.g., 192.168.1.10-192.168.1.20)
+    - FQDN: Fully qualified domain name (e.g., www.example.com)
+    
+    The handler is picked with a single dict lookup on the 'type' field, and
+    both values are worked out in one pass and cached, since configs reuse
+    the same subnets and masks across many address objects.
+    
+    Args:
+        address_key: Tuple built by _address_key()
+        
+    Returns:
+        Tuple of (subType, value). value is None if the format is not recognized.
+    """
+    address_type = address_key[0]
+    if address_type is None:
+        handler = _untyped_address_handler(address_key)
+    else:
+        handler = _ADDRESS_HANDLERS.get(address_type, _classify_subnet)
+    return handler(address_key)
+
+
+def _address_pairs(addresses: Iterable[Dict]) -> Iterable[Tuple[str, Dict]]:
+    """
+    Pair each FortiGate address object name with its properties.
+    
+    Args:
+        addresses: Iterable of address entries in either layout, or a plain
+                   mapping of {'OBJECT_NAME': {properties}, ...}
+        
+    Returns:
+        Iterable of (object_name, properties) tuples
+    """
+    # A plain mapping already holds {'OBJECT_NAME': {properties}, ...}
+    if isinstance(addresses, dict):
+        return addresses.items()
+    
+    # Check the layout once, using the first entry
+    addresses = iter(addresses)
+    first = next(addresses, None)
+    if first is None:
+        return ()
+    addresses = itertools.chain([first], addresses)
+    
+    if len(first) == 1 and 'name' not in first:
+        # Each 'addr_dict' looks like: {'OBJECT_NAME': {properties}}
+        # The object name is the only key in the dictionary
+        # Example: {'SSLVPN_TUNNEL_ADDR1': {uuid: ..., type: ...}}
+        return (next(iter(addr_dict.items())) for addr_dict in addresses)
+    
+    # Each 'addr' looks like: {'name': 'OBJECT_NAME', properties...}
+    return ((addr.get('name', ''), addr) for addr in addresses)
+
+
+def _build_network_object(object_name: str, properties: Dict, verbose: bool = False) -> Dict:
+    """
+    Convert a single FortiGate address object to an FTD network object.
+    
+    Args:
+        object_name: Name of the FortiGate address object
+        properties: Dictionary containing FortiGate address object properties
+        verbose: Print the conversion details
+        
+    Returns:
+        Dictionary representing the FTD network object
+    """
+    # Work out the subType and value together (cached per unique address)
+    address_key = _address_key(properties)
+    try:
+        subtype, value = _classify_address(address_key)
+    except TypeError:
+        # A list or mapping where a plain value belongs can't be hashed for
+        # the cache - classify this address without it
+        subtype, value = _classify_address.__wrapped__(address_key)
+    if value is None:
+        # Fallback: use empty string if no recognized format
+        print(f"  Warning: Could not extract address value from properties: {properties}",
+              file=sys.stderr)
+        value = ''
+    
+    # Create FTD network object structure
+    # FTD FDM API expects objects in this specific format
+    ftd_object = {
+        "name": object_name,  # The object name from the YAML key
+        "description": properties.get('comment', ''),  # Optional description
+        "type": "networkobject",  # FTD object type (always 'networkobject' for addresses)
+        "subType": subtype,  # Specific address type (HOST, NETWORK, RANGE, FQDN)
+        "value": value  # The actual IP/network/range value
+    }
+    
+    # Print conversion details for user visibility
+    # Off by default - one write per object adds up on large configs
+    if verbose:
+        print(f"  Converted: {object_name} -> {subtype} ({value})")
+    
+    return ftd_object
+
+
+def _convert_addresses(entries: Iterable[Tuple[str, Dict]], verbose: bool = False) -> List[Dict]:
+    """Convert (name, properties) address entries into a list in one comprehension."""
+    return [_build_network_object(name, properties, verbose) for name, properties in entries]
+
+
+# Read/write buffer for the YAML and JSON files (1 MiB instead of the default
+# 8 KiB), so multi-MB configs take far fewer read/write system calls
+_IO_BUFFER_SIZE = 1 << 20
+
 
 class FortiGateToFTDConverter:
     """
@@ -68,23 +411,26 @@ class FortiGateToFTDConverter:
     address objects into Cisco FTD FDM API compatible JSON format.
     """
     
-    def __init__(self, fortigate_config: Dict[str, Any]):
+    def __init__(self, fortigate_config: Dict[str, Any], verbose: bool = False):
         """
         Initialize the converter with FortiGate configuration data.
         
         Args:
             fortigate_config: Dictionary containing parsed FortiGate YAML config
+            verbose: Print a line for every converted object
         """
         self.fg_config = fortigate_config
+        self.verbose = verbose
         # This will store all converted FTD network objects
         self.ftd_network_objects = []
     
-    def convert_address_objects(self) -> List[Dict]:
+    def convert_address_objects(self, addresses: Optional[Iterable[Dict]] = None) -> List[Dict]:
         """
         Convert FortiGate address objects to FTD network objects.
         
-        This method processes the 'firewall.address' section of FortiGate config
-        and converts each address entry into FTD's network object format.
+        This method processes the 'firewall_address' (or 'firewall.address')
+        section of FortiGate config and converts each address entry into FTD's
+        network object format.
         
         FortiGate address types supported:
         - subnet: Network address with subnet mask (e.g., "192.168.1.0 255.255.255.0")
@@ -92,160 +438,72 @@ class FortiGateToFTDConverter:
         - fqdn: Fully qualified domain name (e.g., "www.example.com")
         - Individual host IPs are treated as /32 networks
         
+        Args:
+            addresses: Optional list of FortiGate address entries. Defaults to
+                       the address section of the loaded config.
+        
         Returns:
             List of dictionaries, each representing an FTD network object
         """
-        # Navigate through the FortiGate config structure to find address objects
-        # .get() is used to safely access nested keys without errors if they don't exist
-        addresses = self.fg_config.get('firewall_address', {})
-        
-        # If no addresses found, return empty list
-        if not addresses:
-            print("Warning: No address objects found in FortiGate configuration")
-            print("  Expected key: 'firewall_address'")
-            return []
+        if addresses is None:
+            addresses = self.get_address_entries()
         
-        network_objects = []
-        
-         # Process each FortiGate address object
-        # Each 'addr_dict' looks like: {'OBJECT_NAME': {properties}}
-        for addr_dict in addresses:
-            # Extract the object name (it's the only key in the dictionary)
-            # Example: {'SSLVPN_TUNNEL_ADDR1': {uuid: ..., type: ...}}
-            object_name = list(addr_dict.keys())[0]
-
-            # Extract the properties (the value associated with the object name)
-            properties = addr_dict[object_name]
-            
-            # Create FTD network object structure
-            # FTD FDM API expects objects in this specific format
-            ftd_object = {
-                "name": object_name,  # The object name from the YAML key
-                "description": properties.get('comment', ''),  # Optional description
-                "type": "networkobject",  # FTD object type (always 'networkobject' for addresses)
-                "subType": self._determine_address_type(properties),  # Specific address type (HOST, NETWORK, RANGE)
-                "value": self._extract_address_value(properties)  # The actual IP/network/range value
-            }
-            
-            network_objects.append(ftd_object)
-            
-            # Print conversion details for user visibility
-            print(f"  Converted: {object_name} -> {ftd_object['subType']} ({ftd_object['value']})")
+        # Lists and mappings: build the list with one comprehension instead
+        # of resuming the iter_address_objects() generator for every object.
+        # Empty input and other iterables go through the generator, which
+        # also prints the "no address objects" warning.
+        if isinstance(addresses, (list, dict)) and addresses:
+            return _convert_addresses(_address_pairs(addresses), self.verbose)
         
-        return network_objects
+        return list(self.iter_address_objects(addresses))
     
-    def _determine_address_type(self, properties: Dict) -> str:
+    def get_address_entries(self) -> Iterable[Dict]:
         """
-        Determine the FTD address subType based on FortiGate address format.
-        
+        Find the address objects in the loaded FortiGate configuration.
         
-        - If 'type' field exists and equals 'iprange' -> RANGE
-        - If 'subnet' field exists:
-            - Check if netmask is 255.255.255.255 -> HOST
-            - Otherwise -> NETWORK
+        Two layouts are supported:
+        - 'firewall_address': list of {'OBJECT_NAME': {properties}}
+        - 'firewall': {'address': [...]}: list of {'name': 'OBJECT_NAME', ...}
         
-        FTD supports different address subtypes:
-        - HOST: Single IP address (e.g., 192.168.1.10/32)
-        - NETWORK: Network with CIDR notation (e.g., 192.168.1.0/24)
-        - RANGE: IP address range (e.g., 192.168.1.10-192.168.1.20)
-        
-        Args:
-            properties: Dictionary containing FortiGate address object properties
-            
         Returns:
-            String representing FTD subType
+            The address entries, or an empty list if neither layout is present
         """
-        # Check if this is explicitly marked as an IP range
-        if properties.get('type') == 'iprange':
-            return "RANGE"
-        
-        # Check if subnet field exists
-        elif 'subnet' in properties:
-            # Subnet is a list: [IP, NETMASK]
-            # Example: [10.0.0.4, 255.255.255.252] or [10.0.2.0, 255.255.255.0]
-            subnet_list = properties['subnet']
-            if len(subnet_list) >= 2:
-                netmask = str(subnet_list[1])
-                # If netmask is 255.255.255.255, it's a single host
-                if netmask == '255.255.255.255':
-                    return "HOST"
-                else:
-                    return "NETWORK"
-            else:
-                return "NETWORK"
-        
-        else:
-            # Default to HOST if we can't determine type
-            return "HOST"
+        # Navigate through the FortiGate config structure to find address objects
+        # .get() is used to safely access nested keys without errors if they don't exist
+        if not self.fg_config:
+            return []
+        return (self.fg_config.get('firewall_address')
+                or self.fg_config.get('firewall', {}).get('address', []))
     
-    def _extract_address_value(self, properties: Dict) -> str:
+    def iter_address_objects(self, addresses: Iterable[Dict]) -> Iterator[Dict]:
         """
-        Extract and format the address value from FortiGate format to FTD format.
+        Lazily convert FortiGate address entries, yielding one FTD network
+        object at a time.
         
-        NEW LOGIC based on actual FortiGate YAML structure:
-        - For iprange type: Extract start-ip and end-ip, format as "IP1-IP2"
-        - For subnet: Extract from list [IP, NETMASK], convert to "IP/CIDR"
+        Used by main() to write each object to the output file as soon as it
+        is converted, so the full converted list never has to be held in memory.
         
         Args:
-            properties: Dictionary containing FortiGate address object properties
+            addresses: Iterable of FortiGate address entries, each looking like
+                       {'OBJECT_NAME': {properties}} or
+                       {'name': 'OBJECT_NAME', properties...}, or a plain
+                       mapping of {'OBJECT_NAME': {properties}, ...}
             
-        Returns:
-            Formatted string value suitable for FTD
-        """
-        # Check if this is an IP range type
-        if properties.get('type') == 'iprange':
-            # Extract start and end IPs
-            start_ip = properties.get('start-ip', '')
-            end_ip = properties.get('end-ip', '')
-            # FTD expects: "192.168.1.10-192.168.1.20"
-            return f"{start_ip}-{end_ip}"
-        
-        # Check if this has a subnet field
-        elif 'subnet' in properties:
-            # FortiGate subnet format is a list: [IP, NETMASK]
-            # Example: [10.0.0.4, 255.255.255.252] or [10.0.2.0, 255.255.255.0]
-            subnet_list = properties['subnet']
-            
-            if len(subnet_list) >= 2:
-                ip_addr = str(subnet_list[0])
-                netmask = str(subnet_list[1])
-                # Convert netmask to CIDR notation
-                cidr = self._netmask_to_cidr(netmask)
-                # FTD expects: "10.0.0.4/30" or "10.0.2.0/24"
-                return f"{ip_addr}/{cidr}"
-            else:
-                # If format is unexpected, return first element
-                return str(subnet_list[0]) if subnet_list else ''
-        
-        else:
-            # Fallback: return empty string if no recognized format
-            print(f"  Warning: Could not extract address value from properties: {properties}")
-            return ''
-    
-    def _netmask_to_cidr(self, netmask: str) -> int:
+        Yields:
+            Dictionaries, each representing an FTD network object
         """
-        Convert subnet mask (e.g., 255.255.255.0) to CIDR notation (e.g., 24).
+        # If no addresses found, there is nothing to yield
+        if not addresses:
+            print("Warning: No address objects found in FortiGate configuration")
+            print("  Expected key: 'firewall_address' or 'firewall.address'")
+            return
         
-        This is necessary because FortiGate uses traditional netmask notation
-        while FTD API expects CIDR notation.
+        # Pair each object name with its properties
+        entries = _address_pairs(addresses)
         
-        Args:
-            netmask: Subnet mask in dotted decimal format (e.g., "255.255.255.0")
-            
-        Returns:
-            Integer representing CIDR prefix length (e.g., 24)
-        """
-        # Convert netmask to binary and count the number of 1s
-        # Example: 255.255.255.0 = 11111111.11111111.11111111.00000000 = 24 ones
-        try:
-            # Split netmask into octets and convert each to binary
-            binary_str = ''.join([bin(int(x))[2:].zfill(8) for x in netmask.split('.')])
-            # Count the '1' bits
-            return binary_str.count('1')
-        except:
-            # If conversion fails, default to /32 (single host)
-            print(f"Warning: Could not convert netmask '{netmask}', defaulting to /32")
-            return 32
+        # Process each FortiGate address object
+        for object_name, properties in entries:
+            yield _build_network_object(object_name, properties, self.verbose)
     
     def convert_all(self) -> Dict[str, Any]:
         """
@@ -266,6 +524,92 @@ class FortiGateToFTDConverter:
         }
 
 
+def _json_encoder(pretty: bool) -> Callable[[Any], bytes]:
+    """
+    Return a function that encodes one object to JSON bytes.
+    
+    Uses orjson (native code, several times faster) when it is installed,
+    otherwise the standard library json module.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return lambda obj: orjson.dumps(obj, option=option)
+    
+    # One encoder for the whole file - json.dumps(obj, indent=2) would build
+    # a new JSONEncoder for every object
+    encoder = json.JSONEncoder(indent=2 if pretty else None)
+    return lambda obj: encoder.encode(obj).encode('utf-8')
+
+
+def write_network_objects(f, network_objects: Iterable[Dict], pretty: bool = False) -> int:
+    """
+    Write FTD network objects to an open file as they are produced.
+    
+    The output is the same JSON as json.dump({"network_objects": [...]}), but
+    each object is encoded and written individually, so a generator can be
+    passed in and the complete list is never built in memory.
+    
+    Args:
+        f: Open binary file to write the JSON output to
+        network_objects: Iterable of FTD network object dictionaries
+        pretty: Indent the output for readability
+        
+    Returns:
+        Number of network objects written
+    """
+    encode = _json_encoder(pretty)
+    
+    # Wrap the objects the same way the chosen encoder would lay out
+    # {"network_objects": [...]} itself
+    if pretty:
+        opening, separator, closing = b'{\n  "network_objects": [\n', b',\n', b'\n  ]\n}'
+    elif orjson is not None:
+        opening, separator, closing = b'{"network_objects":[', b',', b']}'
+    else:
+        opening, separator, closing = b'{"network_objects": [', b', ', b']}'
+    
+    count = 0
+    for obj in network_objects:
+        if count == 0:
+            f.write(opening)
+        else:
+            f.write(separator)
+        if pretty:
+            # Indent each object to sit inside the "network_objects" array
+            f.write(b'    ' + encode(obj).replace(b'\n', b'\n    '))
+        else:
+            f.write(encode(obj))
+        count += 1
+    
+    # Empty list: let the encoder write the whole (tiny) document
+    if count == 0:
+        f.write(encode({"network_objects": []}))
+    else:
+        f.write(closing)
+    
+    return count
+
+
+def load_yaml_config(stream, loader: str = 'pyyaml') -> Dict[str, Any]:
+    """
+    Parse a FortiGate YAML configuration from an open file.
+    
+    Args:
+        stream: Open file object (text or binary) containing the YAML configuration
+        loader: 'pyyaml' (default) or 'ruamel'
+        
+    Returns:
+        Dictionary containing the parsed FortiGate configuration
+    """
+    if loader == 'ruamel':
+        # ruamel.yaml is optional - only imported when explicitly requested.
+        # typ='safe' with pure=False binds to its C loader.
+        from ruamel.yaml import YAML  # type: ignore[import-not-found]
+        return YAML(typ='safe', pure=False).load(stream)
+    
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
 def main():
     """
     Main function that handles command-line arguments and orchestrates the conversion process.
@@ -277,6 +621,9 @@ def main():
     4. Saves the output as JSON
     5. Displays a summary
     """
+    # Only needed for the command line - not imported when used as a library
+    import argparse
+    
     # Set up command-line argument parser
     # This allows users to specify input file, output file, and formatting options
     parser = argparse.ArgumentParser(
@@ -287,6 +634,8 @@ Examples:
   python fortigate_converter.py fortigate.yaml
   python fortigate_converter.py fortigate.yaml -o output.json
   python fortigate_converter.py fortigate.yaml --pretty
+  python fortigate_converter.py fortigate.yaml --verbose
+  python fortigate_converter.py fortigate.yaml --loader ruamel
   python fortigate_converter.py C:\\configs\\fortigate.yaml -o C:\\output\\ftd.json --pretty
         """
     )
@@ -305,6 +654,17 @@ Examples:
                        action='store_true',
                        help='Format JSON output with indentation for readability')
     
+    # Optional flag: print every converted object
+    parser.add_argument('-v', '--verbose',
+                       action='store_true',
+                       help='Print details for each converted object')
+    
+    # Optional argument: YAML parser to use (PyYAML by default)
+    parser.add_argument('--loader',
+                       choices=['pyyaml', 'ruamel'],
+                       default='pyyaml',
+                       help='YAML parser to use (default: pyyaml)')
+    
     # Parse the command-line arguments
     args = parser.parse_args()
     
@@ -315,8 +675,9 @@ Examples:
     # STEP 1: Load the FortiGate YAML configuration file
     print(f"\nLoading FortiGate configuration from: {args.input_file}")
     try:
-        with open(args.input_file, 'r') as f:
-            fg_config = yaml.safe_load(f)
+        # Binary mode lets the C loader read the bytes directly
+        with open(args.input_file, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+            fg_config = load_yaml_config(f, args.loader)
         print("✓ YAML file loaded successfully")
     except FileNotFoundError:
         print(f"\n✗ ERROR: Input file '{args.input_file}' not found!")
@@ -327,6 +688,11 @@ Examples:
         print("     Windows: C:\\path\\to\\file.yaml")
         print("     Mac/Linux: /path/to/file.yaml")
         return 1
+    except ImportError:
+        print(f"\n✗ ERROR: The '{args.loader}' YAML loader is not installed!")
+        print("  Install it with: pip install ruamel.yaml")
+        print("  Or run without --loader to use PyYAML")
+        return 1
     except yaml.YAMLError as e:
         print(f"\n✗ ERROR: Could not parse YAML file!")
         print(f"  Details: {e}")
@@ -336,21 +702,20 @@ Examples:
         print(f"\n✗ ERROR: {e}")
         return 1
     
-    # STEP 2: Convert the configuration
+    # STEP 2 & 3: Convert the configuration and write the output JSON file
+    # Objects are written as they are converted instead of building the full
+    # FTD config in memory first
     print("\nInitializing converter...")
-    converter = FortiGateToFTDConverter(fg_config)
-    ftd_config = converter.convert_all()
+    converter = FortiGateToFTDConverter(fg_config, verbose=args.verbose)
+    addresses = converter.get_address_entries()
     
-    # STEP 3: Write the output JSON file
-    print(f"\nWriting FTD configuration to: {args.output}")
+    print(f"\nConverting FortiGate address objects and writing to: {args.output}")
     try:
-        with open(args.output, 'w') as f:
-            if args.pretty:
-                # Pretty print: indented, readable format
-                json.dump(ftd_config, f, indent=2)
-            else:
-                # Compact format: smaller file size
-                json.dump(ftd_config, f)
+        with open(args.output, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            # Pretty print: indented, readable format
+            # Compact format: smaller file size
+            total_objects = write_network_objects(
+                f, converter.iter_address_objects(addresses), pretty=args.pretty)
         print("✓ JSON file created successfully")
     except IOError as e:
         print(f"\n✗ ERROR: Could not write output file!")
@@ -361,7 +726,7 @@ Examples:
     print("\n" + "="*60)
     print("CONVERSION COMPLETE")
     print("="*60)
-    print(f"\nTotal Network Objects Converted: {len(ftd_config['network_objects'])}")
+    print(f"\nTotal Network Objects Converted: {total_objects}")
     print(f"\nOutput saved to: {args.output}")
     print("\nNext steps:")
     print("  1. Review the generated JSON file")
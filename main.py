@@ -2,21 +2,114 @@
 """
 FortiGate to Cisco FTD Configuration Converter
 Parses FortiGate YAML configurations and converts them to FTD FDM API JSON format
+
+Requires PyYAML; orjson is used for faster JSON output if installed. Install libyaml (libyaml-dev / libyaml-devel) before PyYAML
+so it can use the much faster C loader; check with:
+    python -c "import yaml; print(yaml.__with_libyaml__)"
+
+The output is UTF-8 either way, but its bytes depend on the encoder. orjson
+writes non-ASCII characters as-is ("h\u00e9llo" becomes "héllo") and its
+compact output has no spaces after ',' and ':'. The JSON data is the same,
+but byte-for-byte comparisons with output from the standard json module differ.
+
+Also runs unchanged under PyPy, which is often faster for large configs:
+    pypy3 main.py fortigate.yaml
 """
 
 import yaml
 import json
 import argparse
-from typing import Dict, List, Any
+import sys
+from typing import Dict, List, Any, Callable, Iterator, Tuple
 from pathlib import Path
 
+# libyaml-backed loader when available, pure-Python SafeLoader otherwise.
+# On PyPy the JIT runs the pure-Python loader well, and the libyaml bindings
+# go through its slower C-API emulation, so SafeLoader is used there.
+if sys.implementation.name == 'pypy':
+    from yaml import SafeLoader as _YamlLoader
+else:
+    try:
+        from yaml import CSafeLoader as _YamlLoader  # type: ignore[assignment]
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+
+# orjson is optional; much faster than the stdlib json module for output
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# FortiGate policy action -> FTD rule action. Lower and upper case spellings
+# are listed so the common cases need no .lower() call.
+_ACTION_MAP = {
+    'accept': 'ALLOW',
+    'allow': 'ALLOW',
+    'deny': 'BLOCK',
+    'reject': 'BLOCK',
+    'ACCEPT': 'ALLOW',
+    'ALLOW': 'ALLOW',
+    'DENY': 'BLOCK',
+    'REJECT': 'BLOCK'
+}
+
+
+def _extract_port_value(svc: Dict) -> str:
+    """Extract port value from FortiGate service"""
+    # Not specialized per config: services often set both tcp- and
+    # udp-portrange (e.g. DNS) and TCP must win, so a UDP-only shortcut would
+    # still need the TCP test. TCP services already return on the first test.
+    if 'tcp-portrange' in svc:
+        return svc['tcp-portrange']
+    elif 'udp-portrange' in svc:
+        return svc['udp-portrange']
+    elif 'sctp-portrange' in svc:
+        return svc['sctp-portrange']
+    else:
+        return "any"
+
+
+def _map_action(fg_action: str) -> str:
+    """Map FortiGate action to FTD action"""
+    ftd_action = _ACTION_MAP.get(fg_action)
+    if ftd_action is None:
+        # Mixed case (e.g. 'Accept') - only then pay for .lower()
+        ftd_action = _ACTION_MAP.get(fg_action.lower(), 'BLOCK')
+    return ftd_action
+
+
+# Policy fields whose names and keywords repeat across most policies
+_POLICY_STRING_FIELDS = ('srcintf', 'dstintf', 'srcaddr', 'dstaddr', 'service', 'action', 'status')
+
+
+def _intern_policy_strings(policies: List[Dict]) -> None:
+    """
+    Intern the zone, address and service names and the keywords in each
+    policy, in place. The YAML loader creates a new string for every
+    occurrence; interned, each distinct name is stored once and the later
+    _ACTION_MAP and reference cache lookups can match on identity.
+    """
+    intern = sys.intern
+    for policy in policies:
+        for field in _POLICY_STRING_FIELDS:
+            value = policy.get(field)
+            if isinstance(value, str):
+                policy[field] = intern(value)
+            elif isinstance(value, list):
+                value[:] = [intern(item) if isinstance(item, str) else item for item in value]
+
 
 class FortiGateToFTDConverter:
     """Converts FortiGate configurations to Cisco FTD FDM API format"""
     
     def __init__(self, fortigate_config: Dict[str, Any]):
         self.fg_config = fortigate_config
-        self.ftd_config = {
+        # Sections every converter reads from, looked up once
+        self._fw = fortigate_config.get('firewall', {})
+        self._svc = self._fw.get('service', {})
+        # Shared {"name": ...} reference dicts, one per distinct name
+        self._ref_cache: Dict[str, Dict[str, str]] = {}
+        self.ftd_config: Dict[str, List[Dict]] = {
             "network_objects": [],
             "network_groups": [],
             "port_objects": [],
@@ -27,156 +120,146 @@ class FortiGateToFTDConverter:
     
     def convert_address_objects(self) -> List[Dict]:
         """Convert FortiGate address objects to FTD network objects"""
-        addresses = self.fg_config.get('firewall', {}).get('address', [])
+        addresses = self._fw.get('address', [])
         network_objects = []
         
         for addr in addresses:
+            # Work out the FTD subtype and value together, checking the
+            # FortiGate address keys in priority order
+            if 'subnet' in addr:
+                sub_type, value = "NETWORK", addr['subnet']
+            elif 'start-ip' in addr and 'end-ip' in addr:
+                sub_type, value = "RANGE", f"{addr['start-ip']}-{addr['end-ip']}"
+            elif 'fqdn' in addr:
+                sub_type, value = "FQDN", addr['fqdn']
+            else:
+                sub_type, value = "HOST", addr.get('ip', '')
+            
             obj = {
                 "name": addr.get('name', ''),
                 "description": addr.get('comment', ''),
                 "type": "networkobject",
-                "subType": self._determine_address_type(addr),
-                "value": self._extract_address_value(addr)
+                "subType": sub_type,
+                "value": value
             }
             network_objects.append(obj)
         
         return network_objects
     
-    def _determine_address_type(self, addr: Dict) -> str:
-        """Determine FTD address subtype from FortiGate address"""
-        if 'subnet' in addr:
-            return "NETWORK"
-        elif 'start-ip' in addr and 'end-ip' in addr:
-            return "RANGE"
-        elif 'fqdn' in addr:
-            return "FQDN"
-        else:
-            return "HOST"
-    
-    def _extract_address_value(self, addr: Dict) -> str:
-        """Extract address value from FortiGate format"""
-        if 'subnet' in addr:
-            return addr['subnet']
-        elif 'start-ip' in addr:
-            return f"{addr['start-ip']}-{addr['end-ip']}"
-        elif 'fqdn' in addr:
-            return addr['fqdn']
-        else:
-            return addr.get('ip', '')
-    
     def convert_address_groups(self) -> List[Dict]:
         """Convert FortiGate address groups to FTD network groups"""
-        groups = self.fg_config.get('firewall', {}).get('addrgrp', [])
-        network_groups = []
+        groups = self._fw.get('addrgrp', [])
+        ref = self._ref
         
-        for grp in groups:
-            obj = {
+        return [
+            {
                 "name": grp.get('name', ''),
                 "description": grp.get('comment', ''),
                 "type": "networkobjectgroup",
-                "objects": [{"name": member} for member in grp.get('member', [])]
+                "objects": [ref(member) for member in grp.get('member', [])]
             }
-            network_groups.append(obj)
-        
-        return network_groups
+            for grp in groups
+        ]
     
     def convert_service_objects(self) -> List[Dict]:
         """Convert FortiGate service objects to FTD port objects"""
-        services = self.fg_config.get('firewall', {}).get('service', {}).get('custom', [])
-        port_objects = []
+        services = self._svc.get('custom', [])
+        extract_port = _extract_port_value
         
-        for svc in services:
-            protocol = svc.get('protocol', 'TCP').upper()
-            
-            obj = {
+        return [
+            {
                 "name": svc.get('name', ''),
                 "description": svc.get('comment', ''),
                 "type": "portobject",
-                "protocol": protocol,
-                "port": self._extract_port_value(svc)
+                "protocol": svc.get('protocol', 'TCP').upper(),
+                "port": extract_port(svc)
             }
-            port_objects.append(obj)
-        
-        return port_objects
-    
-    def _extract_port_value(self, svc: Dict) -> str:
-        """Extract port value from FortiGate service"""
-        if 'tcp-portrange' in svc:
-            return svc['tcp-portrange']
-        elif 'udp-portrange' in svc:
-            return svc['udp-portrange']
-        elif 'sctp-portrange' in svc:
-            return svc['sctp-portrange']
-        else:
-            return "any"
+            for svc in services
+        ]
     
     def convert_service_groups(self) -> List[Dict]:
         """Convert FortiGate service groups to FTD port groups"""
-        groups = self.fg_config.get('firewall', {}).get('service', {}).get('group', [])
-        port_groups = []
+        groups = self._svc.get('group', [])
+        ref = self._ref
         
-        for grp in groups:
-            obj = {
+        return [
+            {
                 "name": grp.get('name', ''),
                 "description": grp.get('comment', ''),
                 "type": "portobjectgroup",
-                "objects": [{"name": member} for member in grp.get('member', [])]
+                "objects": [ref(member) for member in grp.get('member', [])]
             }
-            port_groups.append(obj)
-        
-        return port_groups
+            for grp in groups
+        ]
     
     def convert_firewall_policies(self) -> List[Dict]:
         """Convert FortiGate firewall policies to FTD access rules"""
-        policies = self.fg_config.get('firewall', {}).get('policy', [])
-        access_rules = []
-        
-        for policy in policies:
-            rule = {
-                "name": policy.get('name', f"Rule_{policy.get('policyid', '')}"),
-                "ruleAction": self._map_action(policy.get('action', 'deny')),
-                "enabled": policy.get('status', 'enable') == 'enable',
-                "sourceZones": [{"name": zone} for zone in policy.get('srcintf', [])],
-                "destinationZones": [{"name": zone} for zone in policy.get('dstintf', [])],
-                "sourceNetworks": [{"name": addr} for addr in policy.get('srcaddr', [])],
-                "destinationNetworks": [{"name": addr} for addr in policy.get('dstaddr', [])],
-                "sourcePorts": [{"name": svc} for svc in policy.get('service', [])],
-                "logBegin": policy.get('logtraffic', 'disable') != 'disable',
-                "logEnd": policy.get('logtraffic', 'disable') != 'disable'
-            }
-            access_rules.append(rule)
-        
-        return access_rules
-    
-    def _map_action(self, fg_action: str) -> str:
-        """Map FortiGate action to FTD action"""
-        action_map = {
-            'accept': 'ALLOW',
-            'allow': 'ALLOW',
-            'deny': 'BLOCK',
-            'reject': 'BLOCK'
-        }
-        return action_map.get(fg_action.lower(), 'BLOCK')
+        return self._convert_policies(nat=False)[0]
     
     def convert_nat_policies(self) -> List[Dict]:
         """Convert FortiGate NAT policies to FTD NAT rules"""
-        policies = self.fg_config.get('firewall', {}).get('policy', [])
+        # Common case: no policy uses NAT, so skip building every access rule
+        if not any(policy.get('nat') == 'enable' for policy in self._fw.get('policy', [])):
+            return []
+        return self._convert_policies(access=False)[1]
+    
+    def _convert_policies(self, access: bool = True, nat: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Convert FortiGate policies to FTD access rules and NAT rules in one
+        pass. access / nat select which of the two lists are built; the other
+        is returned empty.
+        """
+        policies = self._fw.get('policy', [])
+        ref = self._ref
+        map_action = _map_action
+        access_rules = []
         nat_rules = []
         
         for policy in policies:
-            if policy.get('nat') == 'enable':
+            # Fields used by both the access rule and the NAT rule, read once
+            policy_id = policy.get('policyid', '')
+            srcintf = policy.get('srcintf', [])
+            dstintf = policy.get('dstintf', [])
+            srcaddr = policy.get('srcaddr', [])
+            dstaddr = policy.get('dstaddr', [])
+            
+            if access:
+                log = policy.get('logtraffic', 'disable') != 'disable'
                 rule = {
-                    "name": f"NAT_{policy.get('policyid', '')}",
+                    # Only format the fallback name when the policy has none
+                    "name": policy['name'] if 'name' in policy else f"Rule_{policy_id}",
+                    "ruleAction": map_action(policy.get('action', 'deny')),
+                    "enabled": policy.get('status', 'enable') == 'enable',
+                    "sourceZones": [ref(zone) for zone in srcintf],
+                    "destinationZones": [ref(zone) for zone in dstintf],
+                    "sourceNetworks": [ref(addr) for addr in srcaddr],
+                    "destinationNetworks": [ref(addr) for addr in dstaddr],
+                    "sourcePorts": [ref(svc) for svc in policy.get('service', [])],
+                    "logBegin": log,
+                    "logEnd": log
+                }
+                access_rules.append(rule)
+            
+            if nat and policy.get('nat') == 'enable':
+                nat_rule = {
+                    "name": f"NAT_{policy_id}",
                     "natType": "DYNAMIC" if policy.get('ippool') == 'enable' else "STATIC",
-                    "sourceInterface": policy.get('srcintf', [{}])[0] if policy.get('srcintf') else {},
-                    "destinationInterface": policy.get('dstintf', [{}])[0] if policy.get('dstintf') else {},
-                    "originalSource": [{"name": addr} for addr in policy.get('srcaddr', [])],
-                    "originalDestination": [{"name": addr} for addr in policy.get('dstaddr', [])],
+                    "sourceInterface": srcintf[0] if srcintf else {},
+                    "destinationInterface": dstintf[0] if dstintf else {},
+                    "originalSource": [ref(addr) for addr in srcaddr],
+                    "originalDestination": [ref(addr) for addr in dstaddr],
                     "translatedSource": policy.get('poolname', 'interface')
                 }
-                nat_rules.append(rule)
+                nat_rules.append(nat_rule)
         
-        return nat_rules
+        return access_rules, nat_rules
+    
+    def _ref(self, name: str) -> Dict[str, str]:
+        """Return the shared {"name": name} reference dict for an object name"""
+        ref = self._ref_cache.get(name)
+        if ref is None:
+            ref = self._ref_cache[name] = {"name": name}
+        return ref
     
     def convert_all(self) -> Dict[str, Any]:
         """Convert all FortiGate configurations to FTD format"""
@@ -184,10 +267,69 @@ class FortiGateToFTDConverter:
         self.ftd_config['network_groups'] = self.convert_address_groups()
         self.ftd_config['port_objects'] = self.convert_service_objects()
         self.ftd_config['port_groups'] = self.convert_service_groups()
-        self.ftd_config['access_policies'] = self.convert_firewall_policies()
-        self.ftd_config['nat_policies'] = self.convert_nat_policies()
+        self.ftd_config['access_policies'], self.ftd_config['nat_policies'] = self._convert_policies()
         
         return self.ftd_config
+    
+    def write_all(self, f, pretty: bool = False) -> Dict[str, int]:
+        """
+        Convert all FortiGate configurations and write the FTD JSON to the
+        binary file f one section at a time, so only one converted list is
+        held in memory at once instead of the whole FTD config.
+        
+        Produces the same JSON as encoding convert_all()'s result.
+        Returns the number of items written for each section.
+        """
+        encode = _json_encoder(pretty)
+        if pretty:
+            open_doc, section_sep, colon, close_doc = b'{\n  ', b',\n  ', b': ', b'\n}'
+        elif orjson is not None:
+            open_doc, section_sep, colon, close_doc = b'{', b',', b':', b'}'
+        else:
+            open_doc, section_sep, colon, close_doc = b'{', b', ', b': ', b'}'
+        
+        counts = {}
+        f.write(open_doc)
+        for index, (key, items) in enumerate(self._iter_sections()):
+            if index:
+                f.write(section_sep)
+            data = encode(items)
+            if pretty:
+                # Nest the encoded list one level inside the top-level object
+                data = data.replace(b'\n', b'\n  ')
+            f.write(encode(key) + colon + data)
+            counts[key] = len(items)
+            del items, data
+        f.write(close_doc)
+        
+        return counts
+    
+    def _iter_sections(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (key, converted list) for each FTD section, in output order"""
+        yield 'network_objects', self.convert_address_objects()
+        yield 'network_groups', self.convert_address_groups()
+        yield 'port_objects', self.convert_service_objects()
+        yield 'port_groups', self.convert_service_groups()
+        access_rules, nat_rules = self._convert_policies()
+        yield 'access_policies', access_rules
+        del access_rules
+        yield 'nat_policies', nat_rules
+
+
+def _json_encoder(pretty: bool) -> Callable[[Any], bytes]:
+    """Return a function that encodes an object to JSON bytes (orjson if installed)"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        
+        def encode_orjson(obj: Any) -> bytes:
+            return orjson.dumps(obj, option=option)
+        return encode_orjson
+    
+    encoder = json.JSONEncoder(indent=2 if pretty else None)
+    
+    def encode_json(obj: Any) -> bytes:
+        return encoder.encode(obj).encode('utf-8')
+    return encode_json
 
 
 def main():
@@ -205,7 +347,7 @@ def main():
     # Load FortiGate YAML configuration
     try:
         with open(args.input_file, 'r') as f:
-            fg_config = yaml.safe_load(f)
+            fg_config = yaml.load(f, Loader=_YamlLoader)
     except FileNotFoundError:
         print(f"Error: Input file '{args.input_file}' not found")
         return 1
@@ -213,27 +355,26 @@ def main():
         print(f"Error parsing YAML: {e}")
         return 1
     
-    # Convert configuration
+    # Store each repeated policy name/keyword once (rewrites the loaded config)
+    if isinstance(fg_config, dict):
+        _intern_policy_strings(fg_config.get('firewall', {}).get('policy', []))
+    
+    # Convert configuration and write output JSON, one section at a time
     converter = FortiGateToFTDConverter(fg_config)
-    ftd_config = converter.convert_all()
     
-    # Write output JSON
     try:
-        with open(args.output, 'w') as f:
-            if args.pretty:
-                json.dump(ftd_config, f, indent=2)
-            else:
-                json.dump(ftd_config, f)
+        with open(args.output, 'wb') as f:
+            counts = converter.write_all(f, pretty=args.pretty)
         print(f"Successfully converted configuration to '{args.output}'")
         
         # Print summary
         print("\nConversion Summary:")
-        print(f"  Network Objects: {len(ftd_config['network_objects'])}")
-        print(f"  Network Groups: {len(ftd_config['network_groups'])}")
-        print(f"  Port Objects: {len(ftd_config['port_objects'])}")
-        print(f"  Port Groups: {len(ftd_config['port_groups'])}")
-        print(f"  Access Policies: {len(ftd_config['access_policies'])}")
-        print(f"  NAT Policies: {len(ftd_config['nat_policies'])}")
+        print(f"  Network Objects: {counts['network_objects']}")
+        print(f"  Network Groups: {counts['network_groups']}")
+        print(f"  Port Objects: {counts['port_objects']}")
+        print(f"  Port Groups: {counts['port_groups']}")
+        print(f"  Access Policies: {counts['access_policies']}")
+        print(f"  NAT Policies: {counts['nat_policies']}")
         
     except IOError as e:
         print(f"Error writing output file: {e}")
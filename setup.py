@@ -0,0 +1,37 @@
+"""
+Optional build step: compile main.py to a native extension with mypyc.
+
+The converter runs as plain Python without this. Compiling needs no code
+changes; the gain is modest (around 5% on a 20k address / 20k policy config)
+because most of the time goes to dict and list operations on untyped YAML
+data, which compiled code still does through the same C API.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+This places a compiled 'main' module (main.*.so / main.*.pyd) next to
+main.py. Python imports it in preference to main.py, so run the compiled
+converter with:
+
+    python -c "import main, sys; sys.exit(main.main())" fortigate.yaml --pretty
+
+Delete the compiled file to go back to the pure-Python version. Without
+mypy installed, setup.py (and pip install .) still works and installs
+main.py uncompiled.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    # No mypyc: set up main.py as a plain pure-Python module
+    ext_modules = []
+else:
+    ext_modules = mypycify(['main.py'])
+
+setup(
+    name='fortigate-to-ftd-converter',
+    py_modules=['main'],
+    ext_modules=ext_modules,
+)